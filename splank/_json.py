@@ -0,0 +1,30 @@
+"""JSON helpers that use orjson when it is installed."""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # optional speedup, install with `splank[fast]`
+    orjson = None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can
+# catch the stdlib exception regardless of which backend is active.
+JSONDecodeError = json.JSONDecodeError
+
+
+def loads(data: str | bytes) -> Any:
+    """Parse a JSON document from str or bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(value: Any, indent: bool = False) -> bytes:
+    """Serialize value to UTF-8 encoded JSON bytes."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(value, option=option)
+    return json.dumps(value, indent=2 if indent else None).encode()
@@ -1,18 +1,18 @@
 """Splank CLI - Main entry point."""
 
 import argparse
-import csv
 import fnmatch
-import json
+import os
 import re
+import shutil
 import sys
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from itertools import islice
+from typing import IO, Callable, Iterable, Iterator
 from urllib.parse import parse_qs, urlparse
 
-from splank._vendor.toon_format import encode as toon_encode
-from typing import Iterator
-
-from splank import __version__
+from splank import __version__, _json
+from splank.client import RESULTS_PAGE_SIZE, SplunkClient
 from splank.config import get_client, init_config
 
 # Internal Splunk fields to drop by default (keep _time and _raw)
@@ -20,53 +20,119 @@ INTERNAL_FIELDS = {"_bkt", "_cd", "_indextime", "_serial", "_sourcetype", "_subs
 # Prefixes for array-style fields like _si[0], _si[1], etc.
 INTERNAL_PREFIXES = ("_si",)
 
-
-def truncate_fields(row: dict, width: int | None) -> dict:
-    """Truncate all string fields to width if needed."""
-    if not width:
-        return row
-    result = {}
-    for k, v in row.items():
-        s = str(v)
-        result[k] = s[:width] + "..." if len(s) > width else v
-    return result
+# Default/internal fields left out of `discover --fields` output
+DISCOVER_SKIP_FIELDS = {
+    "date_hour",
+    "date_mday",
+    "date_minute",
+    "date_month",
+    "date_second",
+    "date_wday",
+    "date_year",
+    "date_zone",
+    "punct",
+    "timestartpos",
+    "timeendpos",
+    "linecount",
+    "index",
+    "splunk_server",
+}
+
+# Fields whose sample values `discover --fields` reports
+DISCOVER_SAMPLE_FIELDS = {
+    "Level",
+    "level",
+    "severity",
+    "status",
+    "sourcetype",
+    "host",
+    "TenantType",
+    "Environment",
+    "environment",
+    "env",
+    "Region",
+    "region",
+    "cluster",
+    "Cluster",
+    "cluster_name",
+    "ClusterName",
+}
+
+# Email addresses are masked in output unless --no-sanitize is given
+_EMAIL_RE = re.compile(r"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+")
 
 
-_EMAIL_RE = re.compile(r"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+")
+@contextmanager
+def _open_output(file: str, mode: str = "w", **kwargs) -> Iterator[IO]:
+    """Open an output file that is only replaced once writing succeeds.
 
+    Regular files (and symlinks to them) are written to a temporary file in
+    the same directory, which takes over the target's mode and then replaces
+    it, so a search that fails midway leaves an existing file untouched.
+    Other targets, such as /dev/stdout, are written directly.
+    """
+    if os.path.exists(file) and not os.path.isfile(file):
+        # Streams can't be read back, so never open them for update
+        with open(file, mode.replace("+", ""), **kwargs) as f:
+            yield f
+        return
 
-def sanitize_fields(row: dict) -> dict:
-    """Mask email addresses in all string field values."""
-    result = {}
-    for k, v in row.items():
-        if isinstance(v, str):
-            result[k] = _EMAIL_RE.sub("***@***.***", v)
-        else:
-            result[k] = v
-    return result
+    target = os.path.realpath(file)
+    directory, name = os.path.split(target)
+    tmp = os.path.join(directory, f".{name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, mode, **kwargs) as f:
+            yield f
+        if os.path.exists(target):
+            shutil.copymode(target, tmp)
+        os.replace(tmp, target)
+    finally:
+        if os.path.lexists(tmp):
+            os.unlink(tmp)
+
+
+def output_bytes(data: bytes, file: str | None = None) -> None:
+    """Output already-encoded results unchanged."""
+    if file:
+        with open(file, "wb") as f:
+            f.write(data)
+    else:
+        sys.stdout.flush()
+        sys.stdout.buffer.write(data)
+        sys.stdout.buffer.flush()
 
 
-def filter_internal_fields(row: dict) -> dict:
-    """Remove internal Splunk fields from a row."""
-    return {
-        k: v
-        for k, v in row.items()
-        if k not in INTERNAL_FIELDS and not k.startswith(INTERNAL_PREFIXES)
-    }
+def _write_json_array(write: Callable[[bytes], object], rows: Iterator[dict]) -> None:
+    """Write rows as an indented JSON array, encoding one row at a time."""
+    first = True
+    for row in rows:
+        write(b"[\n  " if first else b",\n  ")
+        # Nest the row one level; JSON strings never contain raw newlines
+        write(_json.dumps(row, indent=True).replace(b"\n", b"\n  "))
+        first = False
+    write(b"[]" if first else b"\n]")
 
 
-def output_json(results: list[dict], file: str | None = None) -> None:
-    """Output results as JSON."""
-    output = json.dumps(results, indent=2)
+def output_json(results: Iterable[dict], file: str | None = None) -> None:
+    """Output results as an indented JSON array, encoding one row at a time."""
+    rows = iter(results)
     if file:
-        with open(file, "w") as f:
-            f.write(output)
+        # A search failing midway, e.g. one of several profiles, leaves an
+        # existing file as it was
+        with _open_output(file, "wb") as f:
+            _write_json_array(f.write, rows)
     else:
-        print(output)
+        sys.stdout.flush()
+        out = sys.stdout.buffer
+        _write_json_array(out.write, rows)
+        out.write(b"\n")
+        out.flush()
 
 
 def output_toon(results: list[dict], file: str | None = None) -> None:
     """Output results as TOON (Token-Oriented Object Notation)."""
+    from splank._vendor.toon_format import encode as toon_encode
+
     output = toon_encode(results)
     if file:
         with open(file, "w") as f:
@@ -75,87 +141,158 @@ def output_toon(results: list[dict], file: str | None = None) -> None:
         print(output)
 
 
-def output_csv(results: list[dict], file: str | None = None) -> None:
-    """Output results as CSV."""
-    if not results:
+def _widen_csv(
+    f: IO[str], columns: list[str], late: list[dict], sort_columns: bool = False
+) -> None:
+    """Rewrite a seekable CSV file to add the columns first seen in late rows, then append them."""
+    import csv
+    import tempfile
+
+    fields = dict.fromkeys(columns)
+    for row in late:
+        fields.update(dict.fromkeys(row))
+    all_columns = sorted(fields) if sort_columns else list(fields)
+    position = {k: i for i, k in enumerate(columns)}
+
+    f.seek(0)
+    with tempfile.TemporaryFile("w+", newline="") as spool:
+        reader = csv.reader(f)
+        next(reader)  # old header
+        writer = csv.writer(spool)
+        writer.writerow(all_columns)
+        # Rows already written had none of the new columns, so pad them
+        writer.writerows(
+            [record[position[k]] if k in position else "" for k in all_columns]
+            for record in reader
+        )
+        writer.writerows([row.get(k, "") for k in all_columns] for row in late)
+
+        spool.seek(0)
+        f.seek(0)
+        f.truncate()
+        shutil.copyfileobj(spool, f)
+
+
+def _write_csv(
+    f: IO[str],
+    columns: list[str],
+    head: list[dict],
+    rows: Iterator[dict],
+    sort_columns: bool = False,
+    widen: bool = False,
+) -> set[str]:
+    """Write CSV rows, returning fields that had to be dropped.
+
+    With widen, fields missing from columns are kept by rewriting f (which
+    must be seekable) with the extra columns; otherwise they are dropped.
+    """
+    import csv
+
+    known = set(columns)
+    writer = csv.writer(f)
+    writer.writerow(columns)
+    writer.writerows([row.get(k, "") for k in columns] for row in head)
+
+    dropped: set[str] = set()
+    for row in rows:
+        if not known >= row.keys():
+            if widen:
+                late = [row]
+                late.extend(rows)
+                _widen_csv(f, columns, late, sort_columns)
+                return dropped
+            dropped.update(row.keys() - known)
+        writer.writerow([row.get(k, "") for k in columns])
+    return dropped
+
+
+def output_csv(
+    results: Iterable[dict],
+    file: str | None = None,
+    sniff: int = 1000,
+    sort_columns: bool = False,
+) -> None:
+    """Output results as CSV, streaming rows after the first `sniff`.
+
+    Columns are taken from the first `sniff` rows in first-seen order (or
+    alphabetically with sort_columns). When writing to a regular file, a
+    field that only appears later makes the remaining rows buffer and the
+    file is rewritten with the extra columns; on stdout and other streams
+    such fields are dropped with a warning on stderr.
+    """
+    rows = iter(results)
+    head = list(islice(rows, sniff))
+    if not head:
         return
 
-    # Get all unique fields
-    fields: set[str] = set()
-    for row in results:
-        fields.update(row.keys())
-    sorted_fields = sorted(fields)
+    # Get all unique fields, keeping first-seen order. Rows usually share a
+    # schema, so only merge rows that bring new keys.
+    fields: dict[str, None] = {}
+    known = fields.keys()
+    for row in head:
+        if not known >= row.keys():
+            fields.update(dict.fromkeys(row))
+    columns = sorted(fields) if sort_columns else list(fields)
 
     if file:
-        f = open(file, "w", newline="")
+        with _open_output(file, "w+", newline="") as f:
+            dropped = _write_csv(
+                f, columns, head, rows, sort_columns, widen=f.seekable()
+            )
     else:
-        f = sys.stdout
+        dropped = _write_csv(sys.stdout, columns, head, rows, sort_columns)
 
-    writer = csv.DictWriter(f, fieldnames=sorted_fields)
-    writer.writeheader()
-    writer.writerows(results)
+    if dropped:
+        print(
+            f"Warning: dropped CSV columns not seen in the first {sniff} rows: "
+            f"{', '.join(sorted(dropped))}",
+            file=sys.stderr,
+        )
 
-    if file:
-        f.close()
+
+def _table_template(widths: list[int]) -> str:
+    """Build a format string that pads and truncates each column to its width."""
+    return " | ".join(f"{{:<{w}.{w}s}}" for w in widths)
 
 
-def output_table_streaming(results_iter: Iterator[dict]) -> None:
+def output_table_streaming(
+    results_iter: Iterable[dict], sort_columns: bool = False
+) -> None:
     """Output results as a simple table, streaming rows as they arrive."""
-    fields: list[str] | None = None
-    widths: dict[str, int] | None = None
-    buffer: list[dict] = []
-    header_printed = False
-
-    for row in results_iter:
-        if fields is None:
-            # First row - determine fields from it
-            fields = sorted(row.keys())
-            widths = {f: max(len(f), 10) for f in fields}
-
-        # Update widths and buffer until we have enough to print header
-        if not header_printed:
-            buffer.append(row)
-            for f in fields:
-                val = str(row.get(f, ""))
-                widths[f] = max(widths[f], min(len(val), 50))
-
-            # Print header after first few rows to get better column widths
-            if len(buffer) >= 5:
-                header = " | ".join(
-                    f.ljust(widths[f])[: widths[f]] for f in fields
-                )
-                print(header)
-                print("-" * len(header))
-                header_printed = True
-                for buffered_row in buffer:
-                    line = " | ".join(
-                        str(buffered_row.get(f, "")).ljust(widths[f])[: widths[f]]
-                        for f in fields
-                    )
-                    print(line)
-                buffer = []
-        else:
-            # Stream directly
-            line = " | ".join(
-                str(row.get(f, "")).ljust(widths[f])[: widths[f]] for f in fields
-            )
-            print(line)
+    rows = iter(results_iter)
 
-    # Print any remaining buffered rows
-    if buffer:
-        if fields and widths:
-            header = " | ".join(
-                f.ljust(widths[f])[: widths[f]] for f in fields
-            )
-            print(header)
-            print("-" * len(header))
-            for row in buffer:
-                line = " | ".join(
-                    str(row.get(f, "")).ljust(widths[f])[: widths[f]] for f in fields
-                )
-                print(line)
-    elif fields is None:
+    # Buffer the first few rows to get better column widths
+    buffer = list(islice(rows, 5))
+    if not buffer:
         print("No results")
+        return
+
+    fields = sorted(buffer[0]) if sort_columns else list(buffer[0])
+    cells = [[str(row.get(f, "")) for f in fields] for row in buffer]
+    widths = [
+        max(len(f), 10, min(max(len(c[i]) for c in cells), 50))
+        for i, f in enumerate(fields)
+    ]
+
+    template = _table_template(widths)
+    header = template.format(*fields)
+    # Render the line terminator as part of the row template so each row is
+    # a single format call with no further concatenation.
+    emit = (template + "\n").format
+    write = sys.stdout.write
+    lines = [f"{header}\n", "-" * len(header) + "\n"]
+    lines.extend(emit(*row_cells) for row_cells in cells)
+    write("".join(lines))
+
+    # Stream the rest directly
+    for row in rows:
+        write(emit(*[str(row.get(f, "")) for f in fields]))
+
+
+def max_workers(tasks: int, default: int = 16) -> int:
+    """Thread pool size for tasks, capped by $SPLANK_MAX_CONCURRENCY."""
+    limit = int(os.environ.get("SPLANK_MAX_CONCURRENCY", default))
+    return max(1, min(tasks, limit))
 
 
 def get_single_profile(args: argparse.Namespace) -> str | None:
@@ -176,19 +313,89 @@ def _search_one_profile(
     earliest: str,
     latest: str,
     max_results: int,
+    transform: Callable[[dict, str | None], dict] | None = None,
 ) -> tuple[str | None, list[dict]]:
-    """Execute search for a single profile, returning (profile, results)."""
+    """Execute search for a single profile, returning (profile, results).
+
+    If transform is given it is applied to each row in the worker thread.
+    """
     client = get_client(profile)
-    results = list(
-        client.search(
-            query=query,
-            earliest=earliest,
-            latest=latest,
-            max_results=max_results,
-            stream=False,
-        )
+    results = client.search(
+        query=query,
+        earliest=earliest,
+        latest=latest,
+        max_results=max_results,
+        stream=False,
     )
-    return profile, results
+    if transform is None:
+        return profile, list(results)
+    return profile, [transform(row, profile) for row in results]
+
+
+def _search_profiles(
+    profiles: list[str],
+    query: str,
+    earliest: str,
+    latest: str,
+    max_results: int,
+    transform: Callable[[dict, str | None], dict] | None = None,
+) -> Iterator[tuple[str, list[dict]]]:
+    """Search profiles in parallel, yielding (profile, results) as each completes."""
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    with ThreadPoolExecutor(
+        max_workers=max_workers(len(profiles)), thread_name_prefix="splank-search"
+    ) as executor:
+        futures = [
+            executor.submit(
+                _search_one_profile,
+                p,
+                query,
+                earliest,
+                latest,
+                max_results,
+                transform,
+            )
+            for p in profiles
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def mask_emails(value: object) -> object:
+    """Mask email addresses in the strings of a parsed JSON value."""
+    if isinstance(value, str):
+        return _EMAIL_RE.sub("***@***.***", value)
+    if isinstance(value, dict):
+        return {k: mask_emails(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [mask_emails(v) for v in value]
+    return value
+
+
+def zoom_rows(rows: Iterable[dict], sanitize: bool = False) -> Iterator[dict]:
+    """Parse JSON objects from _raw, skipping rows that don't contain one.
+
+    With sanitize, email addresses in the parsed values are masked.
+    """
+    for row in rows:
+        raw = row.get("_raw")
+        if raw is None:
+            continue
+        if not isinstance(raw, str):
+            raw = str(raw)
+        # Strip only when _raw starts or ends with whitespace, to avoid a copy
+        # per row. JSON allows fewer whitespace characters than str.strip()
+        # removes, so the stripped text is what gets parsed.
+        if raw[:1].isspace() or raw[-1:].isspace():
+            raw = raw.strip()
+        if raw[:1] != "{":
+            continue
+        try:
+            parsed = _json.loads(raw)
+        except _json.JSONDecodeError:
+            continue  # Skip non-JSON rows
+        yield mask_emails(parsed) if sanitize else parsed
 
 
 def parse_splunk_url(value: str) -> tuple[str, str | None, str | None] | None:
@@ -229,20 +436,66 @@ def cmd_search(args: argparse.Namespace) -> None:
             file=sys.stderr,
         )
 
+    # -f defaults to toon, or csv with --splunk-csv; left unset by the parser so
+    # an explicit conflicting format can be told apart from the default
+    if args.format is None:
+        args.format = "csv" if args.splunk_csv else "toon"
+
     profiles = args.profiles or [None]  # None = use default profile
     use_streaming = args.format == "table" and not args.output and len(profiles) == 1
 
-    # Apply field transformations
+    # Apply field transformations in a single pass, building one dict per row
+    multi = len(profiles) > 1
+    strip_internal = not args.internal
+    width = args.width
+    sanitize = not args.no_sanitize
+    mask = _EMAIL_RE.sub
+
     def transform(row: dict, profile: str | None = None) -> dict:
-        if profile is not None and len(profiles) > 1:
-            row = {"_profile": profile, **row}
-        if not args.internal:
-            row = filter_internal_fields(row)
-        if args.width:
-            row = truncate_fields(row, args.width)
-        if not args.no_sanitize:
-            row = sanitize_fields(row)
-        return row
+        result = {"_profile": profile} if profile is not None and multi else {}
+        for k, v in row.items():
+            # Every internal field starts with "_", so most user fields skip
+            # the set lookup and prefix scan entirely.
+            if (
+                strip_internal
+                and k[:1] == "_"
+                and (k in INTERNAL_FIELDS or k.startswith(INTERNAL_PREFIXES))
+            ):
+                continue
+            if width:
+                s = v if type(v) is str else str(v)
+                if len(s) > width:
+                    v = s[:width] + "..."
+            if sanitize and isinstance(v, str):
+                v = mask("***@***.***", v)
+            result[k] = v
+        return result
+
+    # --splunk-csv: Splunk renders the CSV and the bytes are written as-is,
+    # without decoding rows or applying any of the transformations above
+    if args.splunk_csv:
+        if args.format != "csv":
+            raise ValueError(f"--splunk-csv can't be combined with -f {args.format}")
+        if len(profiles) > 1 or args.zoom or args.sort_columns:
+            raise ValueError(
+                "--splunk-csv can't be combined with multiple profiles, --zoom "
+                "or --sort-columns"
+            )
+        if args.max_results > RESULTS_PAGE_SIZE:
+            raise ValueError(
+                f"--splunk-csv supports at most {RESULTS_PAGE_SIZE} results"
+            )
+        client = get_client(profiles[0])
+        output_bytes(
+            client.search_csv(
+                query=args.query,
+                earliest=args.earliest,
+                latest=args.latest,
+                max_results=args.max_results,
+            ),
+            args.output,
+        )
+        return
 
     # Single profile: use streaming if appropriate
     if len(profiles) == 1:
@@ -257,67 +510,43 @@ def cmd_search(args: argparse.Namespace) -> None:
 
         # Handle --zoom: extract JSON from _raw
         if args.zoom:
-            zoomed = []
-            for row in results:
-                raw = str(row.get("_raw", "")).strip()
-                if raw.startswith("{"):
-                    try:
-                        zoomed.append(json.loads(raw))
-                    except json.JSONDecodeError:
-                        pass  # Skip non-JSON rows
-            output_toon(zoomed, args.output)
+            output_toon(list(zoom_rows(results, sanitize)), args.output)
             return
 
-        if use_streaming:
-            results = (transform(row) for row in results)
-        else:
-            results = [transform(row) for row in results]
+        results = (transform(row) for row in results)
     else:
         # Multiple profiles: run in parallel
-        all_results: list[dict] = []
-        with ThreadPoolExecutor(max_workers=len(profiles)) as executor:
-            futures = {
-                executor.submit(
-                    _search_one_profile,
-                    p,
-                    args.query,
-                    args.earliest,
-                    args.latest,
-                    args.max_results,
-                ): p
-                for p in profiles
-            }
-            for future in as_completed(futures):
-                profile, profile_results = future.result()
-                for row in profile_results:
-                    all_results.append(transform(row, profile))
+        search_args = (
+            profiles, args.query, args.earliest, args.latest, args.max_results
+        )
 
         # Handle --zoom: extract JSON from _raw
         if args.zoom:
-            zoomed = []
-            for row in all_results:
-                raw = str(row.get("_raw", "")).strip()
-                if raw.startswith("{"):
-                    try:
-                        parsed = json.loads(raw)
-                        if "_profile" in row:
-                            parsed = {"_profile": row["_profile"], **parsed}
-                        zoomed.append(parsed)
-                    except json.JSONDecodeError:
-                        pass
+            zoomed = [
+                {"_profile": profile, **parsed}
+                for profile, rows in _search_profiles(*search_args)
+                for parsed in zoom_rows(rows, sanitize)
+            ]
             output_toon(zoomed, args.output)
             return
 
-        results = all_results
+        # Rows are transformed in the worker threads; hand them to the output
+        # as each profile finishes instead of concatenating them first
+        results = (
+            row
+            for _, rows in _search_profiles(*search_args, transform=transform)
+            for row in rows
+        )
 
     if args.format == "json":
-        output_json(list(results), args.output)
+        output_json(results, args.output)
     elif args.format == "csv":
-        output_csv(list(results), args.output)
+        output_csv(results, args.output, sort_columns=args.sort_columns)
     elif args.format == "toon":
+        # TOON encoding needs the whole result set; materialize it exactly once
         output_toon(list(results), args.output)
     else:
-        output_table_streaming(results)
+        output_table_streaming(results, sort_columns=args.sort_columns)
 
 
 def cmd_clear(args: argparse.Namespace) -> None:
@@ -336,18 +565,96 @@ def cmd_clear(args: argparse.Namespace) -> None:
         print("No jobs to clear.")
         return
 
-    deleted = 0
-    for job in my_jobs:
-        sid = job["content"]["sid"]
+    from concurrent.futures import ThreadPoolExecutor
+
+    def try_delete(sid: str) -> bool:
         try:
             client.delete_job(sid)
-            deleted += 1
+            return True
         except Exception:
-            pass
+            return False
+
+    # Deletions are independent round-trips, so issue them concurrently
+    sids = [job["content"]["sid"] for job in my_jobs]
+    with ThreadPoolExecutor(
+        max_workers=max_workers(len(sids), default=8),
+        thread_name_prefix="splank-clear",
+    ) as executor:
+        deleted = sum(executor.map(try_delete, sids))
 
     print(f"Cleared {deleted} job(s).")
 
 
+def _discover_index(client: SplunkClient, name: str, count: int) -> list[str]:
+    """Discover sourcetypes, fields and sample values for one index as markdown lines."""
+    print(f"Discovering fields for {name}...", file=sys.stderr)
+    output = [f"## {name}", f"- **Events (24h):** {count:,}"]
+
+    # Get sourcetypes
+    try:
+        st_results = list(
+            client.search(
+                f"index={name} | stats count by sourcetype | sort -count",
+                earliest="-24h",
+                max_results=20,
+                fields=["sourcetype"],
+            )
+        )
+        if st_results:
+            sourcetypes = [r.get("sourcetype", "") for r in st_results]
+            output.append(f"- **Sourcetypes:** {', '.join(sourcetypes)}")
+    except Exception:
+        pass
+
+    # Get fields using fieldsummary; maxvals also returns each field's most
+    # common values, so no separate sample-events search is needed
+    try:
+        field_results = list(
+            client.search(
+                f"index={name} | head 1000 | fieldsummary maxvals=5 | where count > 100 | sort -count | head 30",
+                earliest="-24h",
+                max_results=50,
+                fields=["field", "values"],
+            )
+        )
+        if field_results:
+            output.extend(("", "### Fields", ""))
+            field_rows = [
+                f
+                for f in field_results
+                if f.get("field", "") not in DISCOVER_SKIP_FIELDS
+            ]
+            fields = [f.get("field", "") for f in field_rows]
+            output.append("`" + "`, `".join(fields) + "`" if fields else "")
+
+            # Get sample values for interesting fields
+            samples = []
+            for row in field_rows:
+                field = row.get("field", "")
+                if field not in DISCOVER_SAMPLE_FIELDS:
+                    continue
+                try:
+                    values = row.get("values") or []
+                    if isinstance(values, str):
+                        values = _json.loads(values)
+                    if not isinstance(values, list):
+                        continue
+                    seen = {str(v.get("value", "")).strip()[:50] for v in values}
+                except (_json.JSONDecodeError, AttributeError):
+                    continue
+                seen.discard("")
+                if seen:
+                    samples.append(f"- **{field}:** `{'`, `'.join(sorted(seen))}`")
+            if samples:
+                output.extend(("", "### Sample Values", ""))
+                output.extend(samples)
+    except Exception as e:
+        output.append(f"*Error getting fields: {e}*")
+
+    output.append("")
+    return output
+
+
 def cmd_discover(args: argparse.Namespace) -> None:
     """Discover available indexes via search."""
     client = get_client(get_single_profile(args))
@@ -360,22 +667,27 @@ def cmd_discover(args: argparse.Namespace) -> None:
         )
     )
 
-    # Dedupe and sum counts across indexers
+    # Dedupe counts across indexers, keeping the largest per index
     index_counts: dict[str, int] = {}
     for row in results:
         name = row.get("index", "")
         count = int(row.get("count", 0))
-        index_counts[name] = max(index_counts.get(name, 0), count)
-
-    # Filter indexes
-    indexes: list[tuple[str, int]] = []
-    for name in sorted(index_counts.keys()):
-        if not args.all and name.startswith(("_", "history", "summary")):
-            continue
-        if args.patterns:
-            if not any(fnmatch.fnmatch(name, p) for p in args.patterns):
-                continue
-        indexes.append((name, index_counts[name]))
+        prev = index_counts.get(name)
+        if prev is None or count > prev:
+            index_counts[name] = count
+
+    # Filter indexes, matching all glob patterns with one compiled regex
+    pattern_match = None
+    if args.patterns:
+        pattern_match = re.compile(
+            "|".join(f"(?:{fnmatch.translate(p)})" for p in args.patterns)
+        ).match
+    indexes = sorted(
+        (name, count)
+        for name, count in index_counts.items()
+        if (args.all or not name.startswith(("_", "history", "summary")))
+        and (pattern_match is None or pattern_match(name))
+    )
 
     if not args.fields:
         # Simple list mode
@@ -386,114 +698,21 @@ def cmd_discover(args: argparse.Namespace) -> None:
     # Detailed mode with fields - output markdown
     output = ["# Splunk Index Discovery", ""]
 
-    for name, count in indexes:
-        print(f"Discovering fields for {name}...", file=sys.stderr)
-        output.append(f"## {name}")
-        output.append(f"- **Events (24h):** {count:,}")
-
-        # Get sourcetypes
-        try:
-            st_results = list(
-                client.search(
-                    f"index={name} | stats count by sourcetype | sort -count",
-                    earliest="-24h",
-                    max_results=20,
-                )
-            )
-            if st_results:
-                sourcetypes = [r.get("sourcetype", "") for r in st_results]
-                output.append(f"- **Sourcetypes:** {', '.join(sourcetypes)}")
-        except Exception:
-            pass
-
-        # Get fields using fieldsummary
-        try:
-            field_results = list(
-                client.search(
-                    f"index={name} | head 1000 | fieldsummary | where count > 100 | sort -count | head 30",
-                    earliest="-24h",
-                    max_results=50,
-                )
-            )
-            if field_results:
-                output.append("")
-                output.append("### Fields")
-                output.append("")
-                # Skip internal fields
-                skip_fields = {
-                    "date_hour",
-                    "date_mday",
-                    "date_minute",
-                    "date_month",
-                    "date_second",
-                    "date_wday",
-                    "date_year",
-                    "date_zone",
-                    "punct",
-                    "timestartpos",
-                    "timeendpos",
-                    "linecount",
-                    "index",
-                    "splunk_server",
-                }
-                fields = [
-                    f.get("field", "")
-                    for f in field_results
-                    if f.get("field", "") not in skip_fields
-                ]
-                output.append(", ".join(f"`{f}`" for f in fields))
-
-                # Get sample values for interesting fields
-                interesting = {
-                    "Level",
-                    "level",
-                    "severity",
-                    "status",
-                    "sourcetype",
-                    "host",
-                    "TenantType",
-                    "Environment",
-                    "environment",
-                    "env",
-                    "Region",
-                    "region",
-                    "cluster",
-                    "Cluster",
-                    "cluster_name",
-                    "ClusterName",
-                }
-                found_interesting = [f for f in fields if f in interesting]
-                if found_interesting:
-                    output.append("")
-                    output.append("### Sample Values")
-                    output.append("")
-                    # Get a few sample events
-                    try:
-                        sample_events = list(
-                            client.search(
-                                f"index={name} | head 100",
-                                earliest="-1h",
-                                max_results=100,
-                            )
-                        )
-                        for field in found_interesting:
-                            seen: set[str] = set()
-                            for evt in sample_events:
-                                val = str(evt.get(field, "")).strip()[:50]
-                                if val:
-                                    seen.add(val)
-                                if len(seen) >= 5:
-                                    break
-                            if seen:
-                                output.append(
-                                    f"- **{field}:** {', '.join(f'`{s}`' for s in sorted(seen))}"
-                                )
-                    except Exception:
-                        pass
-        except Exception as e:
-            output.append(f"*Error getting fields: {e}*")
-
-        output.append("")
+    # Each index needs several independent searches; run indexes concurrently
+    # but keep the report in index order.
+    if indexes:
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(
+            max_workers=max_workers(len(indexes), default=8),
+            thread_name_prefix="splank-discover",
+        ) as executor:
+            futures = [
+                executor.submit(_discover_index, client, name, count)
+                for name, count in indexes
+            ]
+            for future in futures:
+                output.extend(future.result())
 
     # Write output
     md_content = "\n".join(output)
@@ -521,15 +740,17 @@ def cmd_jobs(args: argparse.Namespace) -> None:
         return
 
     total_mb = 0.0
+    lines = []
     for job in jobs:
         content = job["content"]
         state = content.get("dispatchState", "?")
         sid = content.get("sid", "?")
-        disk = content.get("diskUsage", 0)
-        total_mb += disk / 1024 / 1024
+        mb = content.get("diskUsage", 0) / 1048576
+        total_mb += mb
         search = content.get("search", "")[:50]
-        print(f"{state:10} {disk/1024/1024:6.1f}MB  {sid[:25]:25}  {search}")
+        lines.append(f"{state:10} {mb:6.1f}MB  {sid[:25]:25}  {search}")
 
+    print("\n".join(lines))
     print(f"\nTotal: {total_mb:.1f}MB")
 
 
@@ -581,7 +802,7 @@ def main() -> None:
         "--format",
         "-f",
         choices=["json", "csv", "table", "toon"],
-        default="toon",
+        default=None,
         help="Output format (default: toon)",
     )
     search_parser.add_argument(
@@ -606,6 +827,16 @@ def main() -> None:
         action="store_true",
         help="Parse JSON from _raw and output as toon (ignores other fields)",
     )
+    search_parser.add_argument(
+        "--sort-columns",
+        action="store_true",
+        help="Order csv/table columns alphabetically instead of as returned",
+    )
+    search_parser.add_argument(
+        "--splunk-csv",
+        action="store_true",
+        help="Write CSV rendered by Splunk, unmodified (implies csv format)",
+    )
     search_parser.add_argument(
         "--no-sanitize",
         action="store_true",
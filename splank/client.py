@@ -1,13 +1,27 @@
 """Splunk REST API client."""
 
-import json
+import base64
+import gzip
+import http.client
 import ssl
+import threading
 import time
-import urllib.error
 import urllib.parse
 import urllib.request
 from typing import Iterator
 
+from splank import _json
+
+# Rows fetched per results request, so large result sets are parsed and
+# yielded a page at a time rather than as one document
+RESULTS_PAGE_SIZE = 10_000
+
+# Job status polling starts fast so short searches return quickly, then backs
+# off so long-running searches don't hammer the server
+POLL_INITIAL_DELAY = 0.05
+POLL_MAX_DELAY = 2.0
+POLL_BACKOFF = 1.5
+
 
 def get_ssl_context(verify: bool = True) -> ssl.SSLContext:
     """Create SSL context."""
@@ -31,12 +45,105 @@ class SplunkClient:
         token: str | None = None,
         verify_ssl: bool = True,
     ):
+        self.host = host
+        self.port = port
         self.base_url = f"https://{host}:{port}"
         self.username = username
         self.password = password
         self.token = token
         self.ssl_context = get_ssl_context(verify_ssl)
         self.session_key: str | None = None
+        # Headers sent with every request; Authorization is added once the
+        # client has credentials to send.
+        self._headers = {
+            "Content-Type": "application/x-www-form-urlencoded",
+            "Accept-Encoding": "gzip",
+        }
+        if token:
+            self._headers["Authorization"] = f"Bearer {token}"
+        # One keep-alive connection per thread; http.client connections
+        # can't be shared between threads.
+        self._local = threading.local()
+
+    def _new_connection(self) -> http.client.HTTPSConnection:
+        """Open a connection to Splunk, tunnelling through $HTTPS_PROXY if set."""
+        proxy = urllib.request.getproxies().get("https")
+        if not proxy or urllib.request.proxy_bypass(self.host):
+            return http.client.HTTPSConnection(
+                self.host, self.port, context=self.ssl_context
+            )
+
+        # Like urllib, accept "host:port" without a scheme
+        if "://" not in proxy:
+            proxy = f"http://{proxy}"
+        parsed = urllib.parse.urlparse(proxy)
+        if not parsed.hostname:
+            raise ValueError(f"Invalid HTTPS proxy URL: {proxy!r}")
+        # Like urllib, a proxy URL without a port uses the HTTPS default (443)
+        conn = http.client.HTTPSConnection(
+            parsed.hostname, parsed.port, context=self.ssl_context
+        )
+        tunnel_headers = {}
+        if parsed.username:
+            user = urllib.parse.unquote(parsed.username)
+            password = urllib.parse.unquote(parsed.password or "")
+            token = base64.b64encode(f"{user}:{password}".encode()).decode()
+            tunnel_headers["Proxy-Authorization"] = f"Basic {token}"
+        conn.set_tunnel(self.host, self.port, headers=tunnel_headers)
+        return conn
+
+    def _send(
+        self,
+        method: str,
+        path: str,
+        body: bytes | None,
+        headers: dict[str, str],
+    ) -> bytes:
+        """Send a request over this thread's keep-alive connection.
+
+        Returns the response body; raises RuntimeError for HTTP errors.
+        """
+        conn = getattr(self._local, "conn", None)
+        reused = conn is not None
+        if conn is None:
+            conn = self._local.conn = self._new_connection()
+
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            resp = conn.getresponse()
+        except (
+            http.client.RemoteDisconnected,
+            BrokenPipeError,
+            ConnectionResetError,
+        ):
+            conn.close()
+            self._local.conn = None
+            # The server closed the idle keep-alive connection before sending
+            # any response; retry once on a fresh one. Other failures may come
+            # after a POST was processed, so they are never retried.
+            if not reused:
+                raise
+            return self._send(method, path, body, headers)
+        except (http.client.HTTPException, OSError):
+            conn.close()
+            self._local.conn = None
+            raise
+
+        try:
+            payload = resp.read()
+        except (http.client.HTTPException, OSError):
+            conn.close()
+            self._local.conn = None
+            raise
+
+        if resp.will_close:
+            conn.close()
+            self._local.conn = None
+        if resp.getheader("Content-Encoding") == "gzip":
+            payload = gzip.decompress(payload)
+        if resp.status >= 400:
+            raise RuntimeError(f"HTTP {resp.status}: {payload.decode()}")
+        return payload
 
     def _request(
         self,
@@ -46,27 +153,13 @@ class SplunkClient:
         params: dict | None = None,
     ) -> dict:
         """Make HTTP request to Splunk API."""
-        url = f"{self.base_url}{endpoint}"
+        path = endpoint
         if params:
-            url += "?" + urllib.parse.urlencode(params)
-
-        headers = {"Content-Type": "application/x-www-form-urlencoded"}
-
-        if self.token:
-            headers["Authorization"] = f"Bearer {self.token}"
-        elif self.session_key:
-            headers["Authorization"] = f"Splunk {self.session_key}"
+            path += "?" + urllib.parse.urlencode(params, doseq=True)
 
         body = urllib.parse.urlencode(data).encode() if data else None
 
-        req = urllib.request.Request(url, data=body, headers=headers, method=method)
-
-        try:
-            with urllib.request.urlopen(req, context=self.ssl_context) as resp:
-                return json.loads(resp.read().decode())
-        except urllib.error.HTTPError as e:
-            error_body = e.read().decode()
-            raise RuntimeError(f"HTTP {e.code}: {error_body}")
+        return _json.loads(self._send(method, path, body, self._headers))
 
     def login(self) -> None:
         """Authenticate and get session key."""
@@ -83,6 +176,7 @@ class SplunkClient:
         }
         result = self._request("POST", "/services/auth/login", data=data)
         self.session_key = result["sessionKey"]
+        self._headers["Authorization"] = f"Splunk {self.session_key}"
 
     def search(
         self,
@@ -91,8 +185,39 @@ class SplunkClient:
         latest: str = "now",
         max_results: int = 100,
         stream: bool = False,
+        fields: list[str] | None = None,
     ) -> Iterator[dict]:
-        """Execute a search query and return results."""
+        """Execute a search query and return results.
+
+        If fields is given, Splunk returns only those fields for each result.
+        """
+        sid = self._create_job(query, earliest, latest, max_results)
+
+        if stream:
+            yield from self._stream_results(sid, max_results, fields)
+        else:
+            self._wait_for_job(sid)
+            yield from self._fetch_results(sid, max_results, fields)
+
+    def search_csv(
+        self,
+        query: str,
+        earliest: str = "-24h",
+        latest: str = "now",
+        max_results: int = 100,
+    ) -> bytes:
+        """Execute a search query and return the results as CSV rendered by Splunk."""
+        sid = self._create_job(query, earliest, latest, max_results)
+        self._wait_for_job(sid)
+        params = urllib.parse.urlencode({"output_mode": "csv", "count": max_results})
+        return self._send(
+            "GET", f"/services/search/jobs/{sid}/results?{params}", None, self._headers
+        )
+
+    def _create_job(
+        self, query: str, earliest: str, latest: str, max_results: int
+    ) -> str:
+        """Start a search job and return its sid."""
         # Build search query with head limit to reduce server-side processing
         if query.strip().startswith("|"):
             spl = query
@@ -110,55 +235,66 @@ class SplunkClient:
             "output_mode": "json",
         }
         result = self._request("POST", "/services/search/jobs", data=data)
-        sid = result["sid"]
+        return result["sid"]
 
-        if stream:
-            yield from self._stream_results(sid, max_results)
-        else:
-            # Wait for job to complete
-            while True:
-                status = self._request(
-                    "GET",
-                    f"/services/search/jobs/{sid}",
-                    params={"output_mode": "json"},
-                )
-                state = status["entry"][0]["content"]["dispatchState"]
-                if state == "DONE":
-                    break
-                if state == "FAILED":
-                    raise RuntimeError("Search job failed")
-                time.sleep(0.5)
-
-            # Get results
-            results = self._request(
-                "GET",
-                f"/services/search/jobs/{sid}/results",
-                params={"output_mode": "json", "count": max_results},
-            )
-            yield from results.get("results", [])
+    def _wait_for_job(self, sid: str) -> None:
+        """Poll a search job until it is done."""
+        status_path = f"/services/search/jobs/{sid}?output_mode=json"
+        delay = POLL_INITIAL_DELAY
+        while True:
+            status = self._request("GET", status_path)
+            state = status["entry"][0]["content"]["dispatchState"]
+            if state == "DONE":
+                return
+            if state == "FAILED":
+                raise RuntimeError("Search job failed")
+            time.sleep(delay)
+            delay = min(delay * POLL_BACKOFF, POLL_MAX_DELAY)
+
+    def _fetch_results(
+        self, sid: str, max_results: int, fields: list[str] | None = None
+    ) -> Iterator[dict]:
+        """Fetch results of a finished job, yielding each page as it is parsed."""
+        offset = 0
+        while offset < max_results:
+            count = min(RESULTS_PAGE_SIZE, max_results - offset)
+            params = {"output_mode": "json", "count": count, "offset": offset}
+            if fields:
+                params["f"] = fields
+            page = self._request(
+                "GET", f"/services/search/jobs/{sid}/results", params=params
+            ).get("results", [])
+            yield from page
+            if len(page) < count:
+                return
+            offset += count
 
-    def _stream_results(self, sid: str, max_results: int) -> Iterator[dict]:
+    def _stream_results(
+        self, sid: str, max_results: int, fields: list[str] | None = None
+    ) -> Iterator[dict]:
         """Stream preview results as they become available."""
+        # Only the offset changes between polls, so encode the rest once
+        status_path = f"/services/search/jobs/{sid}?output_mode=json"
+        params = {"output_mode": "json", "count": max_results}
+        if fields:
+            params["f"] = fields
+        preview_path = (
+            f"/services/search/jobs/{sid}/results_preview?"
+            + urllib.parse.urlencode(params, doseq=True)
+            + "&offset="
+        )
         seen_count = 0
+        delay = POLL_INITIAL_DELAY
         while True:
-            status = self._request(
-                "GET",
-                f"/services/search/jobs/{sid}",
-                params={"output_mode": "json"},
-            )
+            status = self._request("GET", status_path)
             state = status["entry"][0]["content"]["dispatchState"]
 
             # Get preview results
-            preview = self._request(
-                "GET",
-                f"/services/search/jobs/{sid}/results_preview",
-                params={
-                    "output_mode": "json",
-                    "count": max_results,
-                    "offset": seen_count,
-                },
-            )
+            preview = self._request("GET", f"{preview_path}{seen_count}")
             new_results = preview.get("results", [])
+            if new_results:
+                # Progress: go back to polling quickly
+                delay = POLL_INITIAL_DELAY
             for result in new_results:
                 yield result
                 seen_count += 1
@@ -169,7 +305,8 @@ class SplunkClient:
                 break
             if state == "FAILED":
                 raise RuntimeError("Search job failed")
-            time.sleep(0.3)
+            time.sleep(delay)
+            delay = min(delay * POLL_BACKOFF, POLL_MAX_DELAY)
 
     def list_jobs(self, count: int = 50) -> list[dict]:
         """List search jobs."""
@@ -182,12 +319,4 @@ class SplunkClient:
 
     def delete_job(self, sid: str) -> None:
         """Delete a search job."""
-        url = f"{self.base_url}/services/search/jobs/{sid}"
-        headers = {}
-        if self.token:
-            headers["Authorization"] = f"Bearer {self.token}"
-        elif self.session_key:
-            headers["Authorization"] = f"Splunk {self.session_key}"
-
-        req = urllib.request.Request(url, headers=headers, method="DELETE")
-        urllib.request.urlopen(req, context=self.ssl_context)
+        self._send("DELETE", f"/services/search/jobs/{sid}", None, self._headers)
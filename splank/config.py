@@ -1,5 +1,6 @@
 """Configuration handling for Splank."""
 
+import functools
 import os
 import shutil
 import subprocess
@@ -25,14 +26,25 @@ def _migrate_legacy_credentials() -> None:
         print(f"Migrated credentials from {_LEGACY_CREDENTIALS_FILE} to {CREDENTIALS_FILE}", file=sys.stderr)
 
 
+@functools.lru_cache(maxsize=4)
+def _parse_credentials(path: Path, mtime_ns: int) -> dict:
+    # mtime_ns is part of the cache key so edits to the file are picked up.
+    with open(path, "rb") as f:
+        return tomllib.load(f)
+
+
 def load_credentials() -> dict:
-    """Load credentials from $XDG_CONFIG_HOME/splank/credentials.toml."""
+    """Load credentials from $XDG_CONFIG_HOME/splank/credentials.toml.
+
+    The parsed file is cached per process and re-read when its mtime changes.
+    """
     _migrate_legacy_credentials()
-    if not CREDENTIALS_FILE.exists():
+    try:
+        mtime_ns = CREDENTIALS_FILE.stat().st_mtime_ns
+    except FileNotFoundError:
         return {}
 
-    with open(CREDENTIALS_FILE, "rb") as f:
-        return tomllib.load(f)
+    return _parse_credentials(CREDENTIALS_FILE, mtime_ns)
 
 
 def get_profile(profile: str | None = None) -> dict: